@@ -0,0 +1,40 @@
+from aiograpi import Client
+from aiograpi.exceptions import PleaseWaitFewMinutes, RateLimitError, ClientThrottledError, FeedbackRequired
+
+from campaigns.schemas import CampaignActionSchema, CampaignAccountSchema, CampaignActionType
+from campaigns.utils import ConcurrencyLimiter
+from instagram.client import get_client, close_client
+
+THROTTLE_EXCEPTIONS = (PleaseWaitFewMinutes, RateLimitError, ClientThrottledError, FeedbackRequired)
+
+
+async def resolve_action(
+        action: CampaignActionSchema,
+        account: CampaignAccountSchema,
+        limiter: ConcurrencyLimiter
+) -> CampaignActionSchema:
+    # a url or username costs a few paced public requests, so it is
+    # resolved to a pk once rather than by every account
+    if action.target.isdigit():
+        return action
+
+    async with limiter.acquire(account.proxy):
+        client = await get_client(account.username, account.password, account.settings, account.proxy)
+        try:
+            if action.type == CampaignActionType.like:
+                target = str(await client.media_pk_from_url(action.target))
+            else:
+                target = str(await client.user_id_from_username(action.target))
+        finally:
+            await close_client(client)
+    return action.model_copy(update={'target': target})
+
+
+async def perform_action(client: Client, action: CampaignActionSchema):
+    # the target is a pk here, see resolve_action
+    if action.type == CampaignActionType.like:
+        await client.media_like(action.target)
+    elif action.type == CampaignActionType.follow:
+        await client.user_follow(action.target)
+    elif action.type == CampaignActionType.direct:
+        await client.direct_send(action.text, user_ids=[int(action.target)])
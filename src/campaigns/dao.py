@@ -0,0 +1,6 @@
+from campaigns.models import CampaignModel
+from dao.base import BaseDAO
+
+
+class CampaignDAO(BaseDAO):
+    model = CampaignModel
@@ -0,0 +1,40 @@
+import uuid
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+
+from auth.orm_annotates import created_at, updated_at
+from campaigns.schemas import CampaignSchema
+from database import Base
+
+
+class CampaignModel(Base):
+    __tablename__ = 'campaign'
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, index=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID, ForeignKey('user.id', ondelete='CASCADE'), index=True)
+    action: Mapped[str] = mapped_column(String(16))
+    target: Mapped[str]
+    status: Mapped[str] = mapped_column(String(16))
+    total: Mapped[int]
+    succeeded: Mapped[int] = mapped_column(default=0)
+    failed: Mapped[int] = mapped_column(default=0)
+    throttled: Mapped[int] = mapped_column(default=0)
+    created_at: Mapped[created_at]
+    updated_at: Mapped[updated_at]
+
+    def to_schema(self):
+        return CampaignSchema(
+            id=self.id,
+            user_id=self.user_id,
+            action=self.action,
+            target=self.target,
+            status=self.status,
+            total=self.total,
+            succeeded=self.succeeded,
+            failed=self.failed,
+            throttled=self.throttled,
+            created_at=self.created_at,
+            updated_at=self.updated_at
+        )
@@ -0,0 +1,42 @@
+import uuid
+from typing import List
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from auth.dependencies import get_current_user
+from auth.schemas import UserSchema
+from campaigns.schemas import CampaignCreateSchema, CampaignSchema
+from campaigns.service import CampaignService
+
+router = APIRouter(
+    prefix='/campaigns',
+    tags=['Campaigns']
+)
+
+
+@router.post('')
+async def run_campaign(
+        campaign: CampaignCreateSchema,
+        user: UserSchema = Depends(get_current_user)
+):
+    campaign_db = await CampaignService.create_campaign(user.id, campaign)
+    results = CampaignService.start_campaign(campaign_db.id, campaign)
+    return StreamingResponse(
+        CampaignService.stream_results(results),
+        media_type='application/x-ndjson',
+        headers={'X-Campaign-Id': str(campaign_db.id)}
+    )
+
+
+@router.get('')
+async def get_campaigns(user: UserSchema = Depends(get_current_user)) -> List[CampaignSchema]:
+    return await CampaignService.get_campaigns(user.id)
+
+
+@router.get('/{campaign_id}')
+async def get_campaign(
+        campaign_id: uuid.UUID,
+        user: UserSchema = Depends(get_current_user)
+) -> CampaignSchema:
+    return await CampaignService.get_campaign(user.id, campaign_id)
@@ -0,0 +1,97 @@
+import enum
+import uuid
+import datetime
+from typing import Optional, List
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class CampaignActionType(str, enum.Enum):
+    like = 'like'
+    follow = 'follow'
+    direct = 'direct'
+
+
+class CampaignStatus(str, enum.Enum):
+    running = 'running'
+    finished = 'finished'
+    aborted = 'aborted'
+
+
+class CampaignResultStatus(str, enum.Enum):
+    success = 'success'
+    failed = 'failed'
+    throttled = 'throttled'
+
+
+class CampaignActionSchema(BaseModel):
+    type: CampaignActionType
+    # media pk or url for likes, user pk or username for follows and directs
+    target: str
+    text: Optional[str] = Field(None)
+
+    @model_validator(mode='after')
+    def check_text(self):
+        if self.type == CampaignActionType.direct and not self.text:
+            raise ValueError('Text is required for direct action')
+        return self
+
+
+class CampaignAccountSchema(BaseModel):
+    username: str
+    password: Optional[str] = Field(None)
+    settings: Optional[dict] = Field(None)
+    proxy: Optional[str] = Field(None)
+
+    @model_validator(mode='after')
+    def check_credentials(self):
+        if not self.password and not self.settings:
+            raise ValueError('Password or settings are required')
+        return self
+
+
+class CampaignCreateSchema(BaseModel):
+    action: CampaignActionSchema
+    accounts: List[CampaignAccountSchema] = Field(min_length=1)
+    concurrency: int = Field(10, ge=1)
+    proxy_concurrency: int = Field(2, ge=1)
+
+
+class CampaignCreateDBSchema(BaseModel):
+    user_id: uuid.UUID
+    action: CampaignActionType
+    target: str
+    status: CampaignStatus
+    total: int
+
+
+class CampaignUpdateSchema(BaseModel):
+    status: Optional[CampaignStatus] = Field(None)
+    succeeded: Optional[int] = Field(None)
+    failed: Optional[int] = Field(None)
+    throttled: Optional[int] = Field(None)
+
+
+class CampaignSchema(BaseModel):
+    id: uuid.UUID
+    user_id: uuid.UUID
+    action: CampaignActionType
+    target: str
+    status: CampaignStatus
+    total: int
+    succeeded: int
+    failed: int
+    throttled: int
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+
+    class Config:
+        from_attributes = True
+
+
+class CampaignResultSchema(BaseModel):
+    campaign_id: uuid.UUID
+    username: str
+    status: CampaignResultStatus
+    detail: Optional[str] = Field(None)
+    elapsed: float
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import Counter
+from typing import List, AsyncIterator, Optional
+
+from fastapi import HTTPException, status
+
+import config
+from campaigns.schemas import CampaignCreateSchema, CampaignCreateDBSchema, CampaignUpdateSchema, \
+    CampaignSchema, CampaignResultSchema, CampaignActionSchema, CampaignAccountSchema, CampaignStatus, \
+    CampaignResultStatus
+from campaigns.models import CampaignModel
+from campaigns.dao import CampaignDAO
+from campaigns.actions import THROTTLE_EXCEPTIONS, resolve_action, perform_action
+from campaigns.utils import ConcurrencyLimiter
+from database import async_session_maker
+from instagram.client import get_client, close_client
+
+logger = logging.getLogger(__name__)
+
+# keeps running campaigns referenced until they finish
+_background_tasks = set()
+
+# bounds accounts across all running campaigns, each campaign's own limits sit under it
+_limiter = ConcurrencyLimiter(int(config.CAMPAIGN_MAX_CONCURRENCY), int(config.CAMPAIGN_PROXY_CONCURRENCY))
+
+
+class CampaignService:
+    @classmethod
+    async def create_campaign(cls, user_id: uuid.UUID, campaign: CampaignCreateSchema) -> CampaignSchema:
+        async with async_session_maker() as session:
+            campaign_db = await CampaignDAO.add(
+                session,
+                CampaignCreateDBSchema(
+                    user_id=user_id,
+                    action=campaign.action.type,
+                    target=campaign.action.target,
+                    status=CampaignStatus.running,
+                    total=len(campaign.accounts)
+                )
+            )
+            await session.commit()
+
+            return campaign_db.to_schema()
+
+    @classmethod
+    async def get_campaign(cls, user_id: uuid.UUID, campaign_id: uuid.UUID) -> CampaignSchema:
+        async with async_session_maker() as session:
+            campaign = await CampaignDAO.find_one(session, id=campaign_id, user_id=user_id)
+            if campaign is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail='Campaign not found'
+                )
+            return campaign.to_schema()
+
+    @classmethod
+    async def get_campaigns(cls, user_id: uuid.UUID) -> List[CampaignSchema]:
+        async with async_session_maker() as session:
+            campaigns = await CampaignDAO.find_all(session, user_id=user_id)
+            return [campaign.to_schema() for campaign in campaigns]
+
+    @classmethod
+    def start_campaign(cls, campaign_id: uuid.UUID, campaign: CampaignCreateSchema) -> asyncio.Queue:
+        # the fan-out runs apart from the request, so a client disconnecting
+        # from the stream does not cancel the campaign or its summary
+        results = asyncio.Queue()
+        task = asyncio.create_task(cls._run_campaign(campaign_id, campaign, results))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+        return results
+
+    @classmethod
+    async def stream_results(cls, results: asyncio.Queue) -> AsyncIterator[str]:
+        while (result := await results.get()) is not None:
+            yield result.model_dump_json() + '\n'
+
+    @classmethod
+    async def _run_campaign(cls, campaign_id: uuid.UUID, campaign: CampaignCreateSchema, results: asyncio.Queue):
+        limiter = ConcurrencyLimiter(campaign.concurrency, campaign.proxy_concurrency, parent=_limiter)
+        tasks = []
+        counts = Counter()
+        campaign_status = CampaignStatus.aborted
+        try:
+            try:
+                try:
+                    action = await resolve_action(campaign.action, campaign.accounts[0], limiter)
+                except Exception as e:
+                    # no account can act without the target, so each reports why
+                    for account in campaign.accounts:
+                        result = cls._result(campaign_id, account, e, 0)
+                        counts[result.status] += 1
+                        results.put_nowait(result)
+                else:
+                    tasks = [
+                        asyncio.create_task(cls._run_account(campaign_id, action, account, limiter))
+                        for account in campaign.accounts
+                    ]
+                    for task in asyncio.as_completed(tasks):
+                        result = await task
+                        counts[result.status] += 1
+                        results.put_nowait(result)
+                        try:
+                            await cls._save_summary(campaign_id, counts)
+                        except Exception:
+                            # progress is best effort, the final write below catches up
+                            logger.exception('Could not save progress of campaign %s', campaign_id)
+                campaign_status = CampaignStatus.finished
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+                try:
+                    await asyncio.shield(cls._save_summary(campaign_id, counts, campaign_status))
+                except Exception:
+                    logger.exception('Could not save summary of campaign %s', campaign_id)
+        finally:
+            results.put_nowait(None)
+
+    @classmethod
+    async def _save_summary(cls, campaign_id: uuid.UUID, counts: Counter, campaign_status: CampaignStatus = None):
+        summary = CampaignUpdateSchema(
+            succeeded=counts[CampaignResultStatus.success],
+            failed=counts[CampaignResultStatus.failed],
+            throttled=counts[CampaignResultStatus.throttled]
+        )
+        if campaign_status is not None:
+            summary.status = campaign_status
+
+        async with async_session_maker() as session:
+            await CampaignDAO.update(session, CampaignModel.id == campaign_id, obj=summary)
+            await session.commit()
+
+    @classmethod
+    async def _run_account(
+            cls,
+            campaign_id: uuid.UUID,
+            action: CampaignActionSchema,
+            account: CampaignAccountSchema,
+            limiter: ConcurrencyLimiter
+    ) -> CampaignResultSchema:
+        async with limiter.acquire(account.proxy):
+            started = time.monotonic()
+            client = None
+            error = None
+            try:
+                client = await get_client(account.username, account.password, account.settings, account.proxy)
+                await perform_action(client, action)
+            except Exception as e:
+                error = e
+            finally:
+                if client is not None:
+                    await close_client(client)
+
+        return cls._result(campaign_id, account, error, time.monotonic() - started)
+
+    @classmethod
+    def _result(
+            cls,
+            campaign_id: uuid.UUID,
+            account: CampaignAccountSchema,
+            error: Optional[Exception],
+            elapsed: float
+    ) -> CampaignResultSchema:
+        if error is None:
+            result_status = CampaignResultStatus.success
+        elif isinstance(error, THROTTLE_EXCEPTIONS):
+            result_status = CampaignResultStatus.throttled
+        else:
+            result_status = CampaignResultStatus.failed
+
+        return CampaignResultSchema(
+            campaign_id=campaign_id,
+            username=account.username,
+            status=result_status,
+            detail=str(error) if error is not None else None,
+            elapsed=elapsed
+        )
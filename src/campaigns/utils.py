@@ -0,0 +1,36 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional, Dict
+
+
+class ConcurrencyLimiter:
+    """
+    Bounds the number of accounts working at the same time, both in total
+    and per proxy. Accounts without a proxy share the server's own address,
+    so they are limited as a single proxy.
+
+    A parent limiter is acquired as well, so a campaign's own limits can sit
+    under the server wide ones shared by every campaign.
+    """
+
+    def __init__(self, limit: int, proxy_limit: int, parent: Optional['ConcurrencyLimiter'] = None):
+        self._parent = parent
+        self._semaphore = asyncio.Semaphore(limit)
+        self._proxy_limit = proxy_limit
+        self._proxy_semaphores: Dict[Optional[str], asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def acquire(self, proxy: Optional[str] = None):
+        proxy_semaphore = self._proxy_semaphores.get(proxy)
+        if proxy_semaphore is None:
+            proxy_semaphore = self._proxy_semaphores[proxy] = asyncio.Semaphore(self._proxy_limit)
+
+        # the proxy slot is taken first, so accounts waiting on a busy proxy
+        # do not hold global slots other proxies could use
+        async with proxy_semaphore:
+            async with self._semaphore:
+                if self._parent is None:
+                    yield
+                else:
+                    async with self._parent.acquire(proxy):
+                        yield
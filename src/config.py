@@ -16,4 +16,17 @@ ALGORITHM = os.environ.get('ALGORITHM')
 ACCESS_TOKEN_EXPIRE_MINUTES = os.environ.get('ACCESS_TOKEN_EXPIRE_MINUTES')
 REFRESH_TOKEN_EXPIRE_DAYS = os.environ.get('REFRESH_TOKEN_EXPIRE_DAYS')
 
+CAMPAIGN_MAX_CONCURRENCY = os.environ.get('CAMPAIGN_MAX_CONCURRENCY', 50)
+CAMPAIGN_PROXY_CONCURRENCY = os.environ.get('CAMPAIGN_PROXY_CONCURRENCY', 5)
+
+INSTAGRAM_BASE_URL = os.environ.get('INSTAGRAM_BASE_URL')
+INSTAGRAM_REQUEST_PAUSE = os.environ.get('INSTAGRAM_REQUEST_PAUSE', 1)
+INSTAGRAM_RECORD_DIR = os.environ.get('INSTAGRAM_RECORD_DIR')
+
+FAKE_INSTAGRAM_FIXTURES_DIR = os.environ.get('FAKE_INSTAGRAM_FIXTURES_DIR')
+FAKE_INSTAGRAM_LATENCY = os.environ.get('FAKE_INSTAGRAM_LATENCY', 0)
+FAKE_INSTAGRAM_LATENCY_JITTER = os.environ.get('FAKE_INSTAGRAM_LATENCY_JITTER', 0)
+FAKE_INSTAGRAM_RATE_LIMIT = os.environ.get('FAKE_INSTAGRAM_RATE_LIMIT', 0)
+FAKE_INSTAGRAM_CHALLENGE = os.environ.get('FAKE_INSTAGRAM_CHALLENGE', 0)
+
 DB_URL = f'postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
\ No newline at end of file
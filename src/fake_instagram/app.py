@@ -0,0 +1,41 @@
+import asyncio
+import random
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+import config
+from fake_instagram.utils import FIXTURES_DIR, load_fixtures, find_fixture
+
+fixtures = load_fixtures(config.FAKE_INSTAGRAM_FIXTURES_DIR or FIXTURES_DIR)
+
+app = FastAPI(
+    title='Fake_Instagram'
+)
+
+
+@app.api_route('/{path:path}', methods=['GET', 'POST'])
+async def replay(request: Request, path: str):
+    latency = float(config.FAKE_INSTAGRAM_LATENCY)
+    jitter = float(config.FAKE_INSTAGRAM_LATENCY_JITTER)
+    await asyncio.sleep(max(0.0, random.uniform(latency - jitter, latency + jitter)))
+
+    if random.random() < float(config.FAKE_INSTAGRAM_RATE_LIMIT):
+        return JSONResponse(
+            {'message': 'Please wait a few minutes before you try again.', 'status': 'fail'},
+            status_code=429
+        )
+    if random.random() < float(config.FAKE_INSTAGRAM_CHALLENGE):
+        return JSONResponse(
+            {
+                'message': 'challenge_required',
+                'challenge': {'api_path': '/challenge/', 'lock': True, 'logout': False},
+                'status': 'fail'
+            },
+            status_code=400
+        )
+
+    fixture = find_fixture(fixtures, request.method, request.url.path, request.query_params)
+    if fixture is None:
+        return JSONResponse({'message': 'Page not found', 'status': 'fail'}, status_code=404)
+    return JSONResponse(fixture.body, status_code=fixture.status_code)
@@ -0,0 +1,157 @@
+"""
+Measures throughput and tail latency of the bot code paths.
+
+Run against a fake Instagram started in-process:
+    python -m fake_instagram.benchmark --serve --scenario campaign --accounts 500
+
+or against whatever INSTAGRAM_BASE_URL points to when --serve is omitted.
+
+aiograpi pauses before every private request (--request-pause, 0 with
+--serve) and keeps public requests one second apart. The lookup scenario
+makes three public requests, so about two seconds of its latency is
+that spacing.
+"""
+import argparse
+import asyncio
+import threading
+import time
+from collections import Counter
+from typing import Awaitable, List, Tuple
+
+import uvicorn
+
+import config
+from campaigns.schemas import CampaignActionSchema, CampaignAccountSchema, CampaignActionType, \
+    CampaignResultStatus
+from campaigns.actions import THROTTLE_EXCEPTIONS, resolve_action, perform_action
+from campaigns.utils import ConcurrencyLimiter
+from instagram.client import get_client, close_client
+
+
+def _account(number: int) -> CampaignAccountSchema:
+    # a stored session skips the login request, as linked accounts do
+    return CampaignAccountSchema(
+        username=f'benchmark_{number}',
+        settings={'authorization_data': {'ds_user_id': str(number + 1), 'sessionid': f'{number + 1}%3Abenchmark'}}
+    )
+
+
+async def _measure(coroutine: Awaitable) -> Tuple[str, float]:
+    started = time.monotonic()
+    try:
+        await coroutine
+        result_status = CampaignResultStatus.success
+    except THROTTLE_EXCEPTIONS:
+        result_status = CampaignResultStatus.throttled
+    except Exception:
+        result_status = CampaignResultStatus.failed
+    return result_status.value, time.monotonic() - started
+
+
+async def _campaign(args) -> List[Tuple[str, float]]:
+    limiter = ConcurrencyLimiter(args.concurrency, args.proxy_concurrency)
+    action = CampaignActionSchema(type=CampaignActionType(args.action), target=args.target, text='benchmark')
+    # campaigns resolve a url or username once, before the fan-out
+    action = await resolve_action(action, _account(args.accounts), limiter)
+
+    async def perform(account: CampaignAccountSchema):
+        client = await get_client(account.username, settings=account.settings)
+        try:
+            await perform_action(client, action)
+        finally:
+            await close_client(client)
+
+    async def run(number: int) -> Tuple[str, float]:
+        # proxies only key the limiter, requests go straight to the fake
+        proxy = f'proxy-{number % args.proxies}' if args.proxies else None
+        async with limiter.acquire(proxy):
+            return await _measure(perform(_account(number)))
+
+    return await asyncio.gather(*[run(number) for number in range(args.accounts)])
+
+
+async def _lookup(args) -> List[Tuple[str, float]]:
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def perform(account: CampaignAccountSchema):
+        client = await get_client(account.username, settings=account.settings)
+        try:
+            await client.user_id_from_username(args.target)
+        finally:
+            await close_client(client)
+
+    async def run(number: int) -> Tuple[str, float]:
+        async with semaphore:
+            return await _measure(perform(_account(number)))
+
+    return await asyncio.gather(*[run(number) for number in range(args.accounts)])
+
+
+SCENARIOS = {
+    'campaign': _campaign,
+    'lookup': _lookup
+}
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def _serve(port: int) -> uvicorn.Server:
+    from fake_instagram.app import app
+
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bot code paths against a fake Instagram')
+    parser.add_argument('--scenario', choices=SCENARIOS, default='campaign')
+    parser.add_argument('--accounts', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--proxies', type=int, default=4)
+    parser.add_argument('--proxy-concurrency', type=int, default=5)
+    parser.add_argument('--action', choices=[action.value for action in CampaignActionType], default='like')
+    parser.add_argument('--target', default='3375193414')
+    parser.add_argument('--request-pause', type=float, help='seconds aiograpi waits before each private request')
+    parser.add_argument('--serve', action='store_true', help='start the fake Instagram in this process')
+    parser.add_argument('--port', type=int, default=8001)
+    args = parser.parse_args()
+
+    server = None
+    if args.serve:
+        server = _serve(args.port)
+        config.INSTAGRAM_BASE_URL = f'http://127.0.0.1:{args.port}'
+    if not config.INSTAGRAM_BASE_URL:
+        parser.error('INSTAGRAM_BASE_URL is not set, refusing to benchmark against Instagram')
+    if args.request_pause is None:
+        args.request_pause = 0 if args.serve else float(config.INSTAGRAM_REQUEST_PAUSE)
+    config.INSTAGRAM_REQUEST_PAUSE = args.request_pause
+
+    started = time.monotonic()
+    results = asyncio.run(SCENARIOS[args.scenario](args))
+    wall_time = time.monotonic() - started
+
+    if server is not None:
+        server.should_exit = True
+
+    counts = Counter(result_status for result_status, _ in results)
+    latencies = [elapsed for _, elapsed in results]
+    print(
+        f'scenario: {args.scenario}, accounts: {args.accounts}, concurrency: {args.concurrency}, '
+        f'request pause: {args.request_pause}s'
+    )
+    print(', '.join(f'{result_status.value}: {counts[result_status.value]}' for result_status in CampaignResultStatus))
+    print(f'wall time: {wall_time:.2f}s, throughput: {len(results) / wall_time:.1f} ops/s')
+    print(
+        f'latency p50: {_percentile(latencies, 50):.3f}s, p95: {_percentile(latencies, 95):.3f}s, '
+        f'p99: {_percentile(latencies, 99):.3f}s, max: {max(latencies):.3f}s'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+from typing import Any, Dict
+
+from pydantic import BaseModel, Field
+
+
+class FixtureSchema(BaseModel):
+    method: str
+    # numeric path segments are stored as {id} so one fixture serves every pk
+    path: str
+    # query parameters that pick what a shared endpoint such as /graphql/query/ returns
+    params: Dict[str, str] = Field(default_factory=dict)
+    status_code: int = Field(200)
+    body: Any
@@ -0,0 +1,97 @@
+import hashlib
+import os
+import re
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Pattern
+
+from fake_instagram.schemas import FixtureSchema
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+SENSITIVE_KEYS = {
+    'username', 'full_name', 'email', 'public_email', 'phone_number', 'public_phone_number',
+    'contact_phone_number', 'biography', 'external_url', 'text', 'message', 'sessionid', 'csrftoken'
+}
+ID_KEYS = {
+    'pk', 'id', 'pk_id', 'strong_id__', 'user_id', 'ds_user_id', 'thread_id', 'thread_v2_id', 'item_id',
+    'media_id', 'profile_pic_id', 'client_context', 'fbid_v2', 'interop_messaging_user_fbid'
+}
+IDENTIFYING_PARAMS = ('query_hash', 'query_id', 'doc_id')
+ANONYMIZED = 'anonymized'
+ANONYMIZED_URL = 'https://example.com/'
+
+
+def normalize_path(path: str) -> str:
+    path = re.sub(r'(?<=/)\d+(_\d+)?(?=/)', '{id}', path)
+    path = re.sub(r'(?<=/users/)[^/]+(?=/usernameinfo/)', '{username}', path)
+    # public profile pages are requested as /<username>/
+    return re.sub(r'^/[^/{]+/$', '/{username}/', path)
+
+
+def path_pattern(path: str) -> Pattern:
+    return re.compile(re.sub(r'\\{\w+\\}', '[^/]+', re.escape(path)))
+
+
+def identifying_params(params: Mapping[str, str]) -> Dict[str, str]:
+    return {key: params[key] for key in IDENTIFYING_PARAMS if key in params}
+
+
+def fake_id(value):
+    # every run of digits maps to a stable fake of the same length, so ids
+    # still line up across fixtures without revealing the real accounts
+    def replace(match: re.Match) -> str:
+        digits = match.group()
+        number = int(hashlib.sha256(digits.encode()).hexdigest(), 16)
+        return str(10 ** (len(digits) - 1) + number % (9 * 10 ** (len(digits) - 1)))
+
+    faked = re.sub(r'\d+', replace, str(value))
+    return int(faked) if isinstance(value, int) else faked
+
+
+def anonymize(data: Any, key: Optional[str] = None) -> Any:
+    if isinstance(data, dict):
+        return {k: anonymize(v, k) for k, v in data.items()}
+    if isinstance(data, list):
+        return [anonymize(item, key) for item in data]
+    if key in ID_KEYS and isinstance(data, (int, str)) and not isinstance(data, bool):
+        return fake_id(data)
+    if isinstance(data, str):
+        if data.startswith('http'):
+            return ANONYMIZED_URL
+        if key in SENSITIVE_KEYS:
+            return ANONYMIZED
+    return data
+
+
+def load_fixtures(directory: str = FIXTURES_DIR) -> List[Tuple[Pattern, FixtureSchema]]:
+    fixtures = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.json'):
+            continue
+        with open(os.path.join(directory, filename), encoding='utf-8') as file:
+            fixture = FixtureSchema.model_validate_json(file.read())
+        fixtures.append((path_pattern(fixture.path), fixture))
+    return fixtures
+
+
+def find_fixture(
+    fixtures: List[Tuple[Pattern, FixtureSchema]],
+    method: str,
+    path: str,
+    params: Optional[Mapping[str, str]] = None
+) -> Optional[FixtureSchema]:
+    params = identifying_params(params or {})
+    for pattern, fixture in fixtures:
+        if fixture.method == method and fixture.params == params and pattern.fullmatch(path):
+            return fixture
+    return None
+
+
+def save_fixture(directory: str, method: str, path: str, params: Mapping[str, str], status_code: int, body: Any):
+    path = normalize_path(path)
+    params = identifying_params(params)
+    name = re.sub(r'[^0-9a-z]+', '_', ' '.join([method, path, *params.values()]).lower()).strip('_')
+    fixture = FixtureSchema(method=method, path=path, params=params, status_code=status_code, body=anonymize(body))
+
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f'{name}.json'), 'w', encoding='utf-8') as file:
+        file.write(fixture.model_dump_json(indent=2))
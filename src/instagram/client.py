@@ -0,0 +1,100 @@
+from typing import Optional
+
+import httpx
+from aiograpi import Client, reqwests
+
+import config
+from fake_instagram.utils import save_fixture
+
+
+async def get_client(
+    username: str,
+    password: Optional[str] = None,
+    settings: Optional[dict] = None,
+    proxy: Optional[str] = None
+) -> Client:
+    client = Client(
+        settings=settings or {},
+        proxy=proxy,
+        request_timeout=float(config.INSTAGRAM_REQUEST_PAUSE)
+    )
+    # aiograpi reads the following cache in user_follow but never creates it
+    client._users_following = {}
+
+    # aiograpi demands a password even when the stored session is valid
+    if not client.user_id:
+        try:
+            await client.login(username, password)
+        except Exception:
+            await close_client(client)
+            raise
+    return client
+
+
+async def close_client(client: Client):
+    # aiograpi's Client has no close method, so its sessions are closed one by one
+    for session in (client.private, client.public, client.graphql):
+        await session._close()
+
+
+def _event_hooks() -> dict:
+    hooks = {'request': [], 'response': []}
+    if config.INSTAGRAM_BASE_URL:
+        hooks['request'].append(_rewrite_url)
+    if config.INSTAGRAM_RECORD_DIR:
+        hooks['response'].append(_record_response)
+    return hooks
+
+
+async def _rewrite_url(request: httpx.Request):
+    # aiograpi builds absolute instagram.com urls, so they are redirected
+    # here rather than through a base url option
+    url = httpx.URL(config.INSTAGRAM_BASE_URL)
+    request.url = request.url.copy_with(
+        scheme=url.scheme, host=url.host, port=url.port, path=_base_path() + request.url.path
+    )
+
+
+def _base_path() -> str:
+    # a base url may mount the fake under a prefix, such as http://host/instagram
+    if not config.INSTAGRAM_BASE_URL:
+        return ''
+    return httpx.URL(config.INSTAGRAM_BASE_URL).path.rstrip('/')
+
+
+async def _record_response(response: httpx.Response):
+    # errors are injected by the fake itself, only good answers are replayed
+    if not response.is_success:
+        return
+    await response.aread()
+    try:
+        body = response.json()
+    except ValueError:
+        return
+    request = response.request
+    path = request.url.path.removeprefix(_base_path())
+    save_fixture(
+        config.INSTAGRAM_RECORD_DIR, request.method, path, request.url.params, response.status_code, body
+    )
+
+
+def _set_client(session: reqwests.Session):
+    _reqwests_set_client(session)
+    session._client.event_hooks = _event_hooks()
+
+
+async def _request(method, url, proxies=None, **kwargs):
+    # reqwests.request with the event hooks installed
+    if 'timeout' not in kwargs:
+        kwargs['timeout'] = reqwests.DEFAULT_TIMEOUT
+    async with httpx.AsyncClient(
+        proxies=proxies, verify=False, follow_redirects=True, event_hooks=_event_hooks()
+    ) as client:
+        return await client.request(method, url, **kwargs)
+
+
+# every httpx client aiograpi creates comes from one of these two, including
+# the clients rebuilt by set_proxy and the challenge flow's own session
+_reqwests_set_client = reqwests.Session._set_client
+reqwests.Session._set_client = _set_client
+reqwests.request = _request
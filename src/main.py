@@ -4,6 +4,7 @@ import sys
 from fastapi import FastAPI
 
 from auth.router import router as auth_router
+from campaigns.router import router as campaigns_router
 
 sys.path.insert(1, os.path.join(sys.path[0], '..'))
 
@@ -11,4 +12,5 @@ app = FastAPI(
     title='InstaBot_API'
 )
 
-app.include_router(auth_router)
\ No newline at end of file
+app.include_router(auth_router)
+app.include_router(campaigns_router)
\ No newline at end of file
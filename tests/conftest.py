@@ -0,0 +1,6 @@
+import os
+
+# database builds its engine on import, it never connects unless a session is used
+for name, value in {'DB_USER': 'test', 'DB_PASSWORD': 'test', 'DB_HOST': 'localhost', 'DB_PORT': '5432',
+                    'DB_NAME': 'test'}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import uuid
+from collections import Counter
+
+import pytest
+from aiograpi.exceptions import PleaseWaitFewMinutes, ClientError
+from pydantic import ValidationError
+
+import campaigns.service
+from campaigns.schemas import CampaignAccountSchema, CampaignActionSchema, CampaignCreateSchema, \
+    CampaignResultSchema, CampaignResultStatus, CampaignStatus
+from campaigns.service import CampaignService
+from campaigns.utils import ConcurrencyLimiter
+
+
+def run_accounts(limiter, proxies, duration=0.01):
+    # a list of limiters stands for several campaigns taking turns
+    limiters = limiter if isinstance(limiter, list) else [limiter]
+    active = Counter()
+    peaks = Counter()
+    started = []
+
+    async def work(number, proxy):
+        async with limiters[number % len(limiters)].acquire(proxy):
+            started.append(proxy)
+            active[proxy] += 1
+            active['total'] += 1
+            peaks[proxy] = max(peaks[proxy], active[proxy])
+            peaks['total'] = max(peaks['total'], active['total'])
+            await asyncio.sleep(duration)
+            active[proxy] -= 1
+            active['total'] -= 1
+
+    async def main():
+        await asyncio.gather(*[work(number, proxy) for number, proxy in enumerate(proxies)])
+
+    asyncio.run(main())
+    return peaks, started
+
+
+def test_global_limit():
+    limiter = ConcurrencyLimiter(limit=3, proxy_limit=10)
+    peaks, started = run_accounts(limiter, [f'proxy-{number}' for number in range(20)])
+
+    assert peaks['total'] == 3
+    assert len(started) == 20
+
+
+def test_proxy_limit():
+    limiter = ConcurrencyLimiter(limit=10, proxy_limit=2)
+    peaks, started = run_accounts(limiter, ['proxy-a', 'proxy-b'] * 6)
+
+    assert peaks['proxy-a'] == 2
+    assert peaks['proxy-b'] == 2
+    assert peaks['total'] == 4
+    assert len(started) == 12
+
+
+def test_accounts_without_proxy_share_limit():
+    limiter = ConcurrencyLimiter(limit=10, proxy_limit=2)
+    peaks, _ = run_accounts(limiter, [None] * 6)
+
+    assert peaks[None] == 2
+    assert peaks['total'] == 2
+
+
+def test_busy_proxy_does_not_hold_global_slots():
+    limiter = ConcurrencyLimiter(limit=2, proxy_limit=1)
+    _, started = run_accounts(limiter, ['proxy-a'] * 5 + ['proxy-b'])
+
+    assert started[:2] == ['proxy-a', 'proxy-b']
+
+
+def test_parent_limits_are_shared_by_campaigns():
+    parent = ConcurrencyLimiter(limit=3, proxy_limit=2)
+    campaigns = [ConcurrencyLimiter(limit=10, proxy_limit=10, parent=parent) for _ in range(2)]
+    peaks, started = run_accounts(campaigns, ['proxy-a'] * 8 + [f'proxy-{number}' for number in range(8)])
+
+    assert peaks['proxy-a'] == 2
+    assert peaks['total'] == 3
+    assert len(started) == 16
+
+
+def test_account_requires_password_or_settings():
+    with pytest.raises(ValidationError, match='Password or settings are required'):
+        CampaignAccountSchema(username='account')
+
+    assert CampaignAccountSchema(username='account', password='password').password == 'password'
+    assert CampaignAccountSchema(username='account', settings={'uuids': {}}).settings == {'uuids': {}}
+
+
+def run_campaign(monkeypatch, accounts, target='1', save_error=None):
+    """
+    Streams a campaign whose accounts finish after the given delay with the
+    given status, and returns the streamed results and the summary writes.
+    """
+    outcomes = dict(accounts)
+    saved = []
+
+    async def run_account(cls, campaign_id, action, account, limiter):
+        delay, result_status = outcomes[account.username]
+        await asyncio.sleep(delay)
+        return CampaignResultSchema(
+            campaign_id=campaign_id, username=account.username, status=result_status, elapsed=delay
+        )
+
+    async def save_summary(cls, campaign_id, counts, campaign_status=None):
+        saved.append((dict(counts), campaign_status))
+        if save_error is not None:
+            raise save_error
+
+    monkeypatch.setattr(CampaignService, '_run_account', classmethod(run_account))
+    monkeypatch.setattr(CampaignService, '_save_summary', classmethod(save_summary))
+    campaign = CampaignCreateSchema(
+        action=CampaignActionSchema(type='like', target=target),
+        accounts=[CampaignAccountSchema(username=username, password='password') for username in outcomes]
+    )
+
+    async def main():
+        results = CampaignService.start_campaign(uuid.uuid4(), campaign)
+        return [json.loads(line) async for line in CampaignService.stream_results(results)]
+
+    return asyncio.run(asyncio.wait_for(main(), 5)), saved
+
+
+def test_campaign_streams_results_in_completion_order(monkeypatch):
+    lines, saved = run_campaign(monkeypatch, {
+        'slow': (0.03, CampaignResultStatus.success),
+        'fast': (0.01, CampaignResultStatus.throttled),
+        'middle': (0.02, CampaignResultStatus.failed)
+    })
+
+    assert [line['username'] for line in lines] == ['fast', 'middle', 'slow']
+    assert [line['status'] for line in lines] == ['throttled', 'failed', 'success']
+    assert saved[-1] == (
+        {CampaignResultStatus.success: 1, CampaignResultStatus.failed: 1, CampaignResultStatus.throttled: 1},
+        CampaignStatus.finished
+    )
+
+
+def test_campaign_stream_ends_when_summary_write_fails(monkeypatch):
+    lines, saved = run_campaign(monkeypatch, {
+        'first': (0.01, CampaignResultStatus.success),
+        'second': (0.02, CampaignResultStatus.success)
+    }, save_error=ConnectionError('database is down'))
+
+    assert [line['username'] for line in lines] == ['first', 'second']
+    assert saved[-1] == ({CampaignResultStatus.success: 2}, CampaignStatus.finished)
+
+
+def test_campaign_reports_unresolved_target_for_every_account(monkeypatch):
+    async def resolve_action(action, account, limiter):
+        raise PleaseWaitFewMinutes('Please wait a few minutes before you try again.')
+
+    monkeypatch.setattr(campaigns.service, 'resolve_action', resolve_action)
+    lines, saved = run_campaign(monkeypatch, {
+        'first': (0, CampaignResultStatus.success),
+        'second': (0, CampaignResultStatus.success)
+    }, target='username')
+
+    assert [line['status'] for line in lines] == ['throttled', 'throttled']
+    assert lines[0]['detail'] == 'Please wait a few minutes before you try again.'
+    assert saved[-1] == ({CampaignResultStatus.throttled: 2}, CampaignStatus.finished)
+
+
+@pytest.mark.parametrize('error, result_status', [
+    (None, CampaignResultStatus.success),
+    (PleaseWaitFewMinutes('Please wait a few minutes before you try again.'), CampaignResultStatus.throttled),
+    (ClientError('Not authorized to view user'), CampaignResultStatus.failed)
+])
+def test_account_result_status(monkeypatch, error, result_status):
+    closed = []
+
+    async def get_client(*args):
+        return object()
+
+    async def close_client(client):
+        closed.append(client)
+
+    async def perform_action(client, action):
+        if error is not None:
+            raise error
+
+    monkeypatch.setattr(campaigns.service, 'get_client', get_client)
+    monkeypatch.setattr(campaigns.service, 'close_client', close_client)
+    monkeypatch.setattr(campaigns.service, 'perform_action', perform_action)
+    account = CampaignAccountSchema(username='account', password='password')
+    result = asyncio.run(CampaignService._run_account(
+        uuid.uuid4(), CampaignActionSchema(type='like', target='1'), account, ConcurrencyLimiter(1, 1)
+    ))
+
+    assert result.status == result_status
+    assert result.detail == (str(error) if error is not None else None)
+    assert len(closed) == 1
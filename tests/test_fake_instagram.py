@@ -0,0 +1,149 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import config
+from fake_instagram.app import app
+from fake_instagram.utils import ANONYMIZED, ANONYMIZED_URL, normalize_path, path_pattern, anonymize, fake_id, \
+    find_fixture, save_fixture, load_fixtures
+from fake_instagram.schemas import FixtureSchema
+
+
+def test_normalize_path():
+    assert normalize_path('/api/v1/media/2277033926878261772_1903424587/like/') == '/api/v1/media/{id}/like/'
+    assert normalize_path('/api/v1/friendships/create/1903424587/') == '/api/v1/friendships/create/{id}/'
+    assert normalize_path('/api/v1/users/example/usernameinfo/') == '/api/v1/users/{username}/usernameinfo/'
+    assert normalize_path('/example/') == '/{username}/'
+    assert normalize_path('/graphql/query/') == '/graphql/query/'
+    assert normalize_path('/api/v1/direct_v2/threads/broadcast/text/') == '/api/v1/direct_v2/threads/broadcast/text/'
+
+
+def test_path_pattern():
+    pattern = path_pattern('/api/v1/users/{id}/info/')
+
+    assert pattern.fullmatch('/api/v1/users/1903424587/info/')
+    assert not pattern.fullmatch('/api/v1/users/1903424587/info/extra/')
+    assert not pattern.fullmatch('/api/v1/users/info/')
+
+
+def test_find_fixture():
+    like = FixtureSchema(method='POST', path='/api/v1/media/{id}/like/', body={'status': 'ok'})
+    user = FixtureSchema(method='GET', path='/graphql/query/', params={'query_hash': 'user'}, body={'user': 1})
+    media = FixtureSchema(method='GET', path='/graphql/query/', params={'query_hash': 'media'}, body={'media': 1})
+    fixtures = [(path_pattern(fixture.path), fixture) for fixture in (like, user, media)]
+
+    assert find_fixture(fixtures, 'POST', '/api/v1/media/123/like/') is like
+    assert find_fixture(fixtures, 'GET', '/api/v1/media/123/like/') is None
+    assert find_fixture(fixtures, 'GET', '/graphql/query/', {'query_hash': 'media', 'variables': '{}'}) is media
+    assert find_fixture(fixtures, 'GET', '/graphql/query/', {'query_hash': 'user'}) is user
+    assert find_fixture(fixtures, 'GET', '/graphql/query/') is None
+
+
+def test_fake_id():
+    assert fake_id(1903424587) == fake_id(1903424587)
+    assert isinstance(fake_id(1903424587), int)
+    assert fake_id(1903424587) != 1903424587
+    assert len(str(fake_id(1903424587))) == 10
+
+    media_id = fake_id('2277033926878261772_1903424587')
+    assert media_id.endswith(f'_{fake_id(1903424587)}')
+
+
+def test_anonymize():
+    body = {
+        'user': {
+            'pk': 1903424587,
+            'id': '1903424587',
+            'username': 'example',
+            'full_name': 'Example Person',
+            'profile_pic_url': 'https://scontent.cdninstagram.com/example.jpg',
+            'is_private': False,
+            'follower_count': 1280
+        },
+        'items': [{'item_id': '32178629102846295732519538218729472', 'text': 'hello', 'user_id': 1903424587}],
+        'message': 'hello there',
+        'status': 'ok'
+    }
+    result = anonymize(body)
+
+    assert result['user']['pk'] == fake_id(1903424587)
+    assert result['user']['id'] == str(fake_id(1903424587))
+    assert result['items'][0]['user_id'] == result['user']['pk']
+    assert result['items'][0]['item_id'] != body['items'][0]['item_id']
+    assert result['user']['username'] == ANONYMIZED
+    assert result['user']['full_name'] == ANONYMIZED
+    assert result['items'][0]['text'] == ANONYMIZED
+    assert result['message'] == ANONYMIZED
+    assert result['user']['profile_pic_url'] == ANONYMIZED_URL
+    assert result['user']['is_private'] is False
+    assert result['user']['follower_count'] == 1280
+    assert result['status'] == 'ok'
+
+
+def test_save_and_load_fixture(tmp_path):
+    save_fixture(
+        str(tmp_path), 'GET', '/graphql/query/', {'query_hash': 'abc', 'variables': '{"user_id": "1"}'}, 200,
+        {'data': {'user': {'id': '1903424587'}}, 'status': 'ok'}
+    )
+    save_fixture(str(tmp_path), 'GET', '/graphql/query/', {'query_hash': 'def'}, 200, {'status': 'ok'})
+    fixtures = load_fixtures(str(tmp_path))
+
+    assert len(fixtures) == 2
+    fixture = find_fixture(fixtures, 'GET', '/graphql/query/', {'query_hash': 'abc'})
+    assert fixture.params == {'query_hash': 'abc'}
+    assert fixture.body['data']['user']['id'] == str(fake_id(1903424587))
+
+
+def test_bundled_fixtures_load():
+    fixtures = load_fixtures()
+
+    assert find_fixture(fixtures, 'GET', '/example/')
+    assert find_fixture(fixtures, 'GET', '/graphql/query/', {'query_hash': 'ad99dd9d3646cc3c0dda65debcd266a7'})
+    assert find_fixture(fixtures, 'POST', '/api/v1/media/123/like/')
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    for name in ('LATENCY', 'LATENCY_JITTER', 'RATE_LIMIT', 'CHALLENGE'):
+        monkeypatch.setattr(config, f'FAKE_INSTAGRAM_{name}', 0)
+    return TestClient(app)
+
+
+def test_replay_serves_fixtures(fake):
+    response = fake.post('/api/v1/media/2277033926878261772_3375193414/like/')
+    assert response.status_code == 200
+    assert response.json() == {'status': 'ok'}
+
+    response = fake.get('/graphql/query/', params={'query_hash': 'ad99dd9d3646cc3c0dda65debcd266a7'})
+    assert response.status_code == 200
+
+    response = fake.get('/api/v1/unknown/')
+    assert response.status_code == 404
+    assert response.json()['message'] == 'Page not found'
+
+
+def test_replay_injects_rate_limit(fake, monkeypatch):
+    monkeypatch.setattr(config, 'FAKE_INSTAGRAM_RATE_LIMIT', 1)
+    response = fake.post('/api/v1/media/123/like/')
+
+    assert response.status_code == 429
+    assert 'Please wait a few minutes' in response.json()['message']
+
+
+def test_replay_injects_challenge(fake, monkeypatch):
+    monkeypatch.setattr(config, 'FAKE_INSTAGRAM_CHALLENGE', 1)
+    response = fake.post('/api/v1/media/123/like/')
+
+    assert response.status_code == 400
+    assert response.json()['message'] == 'challenge_required'
+
+
+def test_replay_latency(fake, monkeypatch):
+    monkeypatch.setattr(config, 'FAKE_INSTAGRAM_LATENCY', 0.2)
+    monkeypatch.setattr(config, 'FAKE_INSTAGRAM_LATENCY_JITTER', 0.1)
+    started = time.monotonic()
+    response = fake.post('/api/v1/media/123/like/')
+
+    assert response.status_code == 200
+    assert time.monotonic() - started >= 0.1
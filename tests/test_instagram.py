@@ -0,0 +1,79 @@
+import asyncio
+import json
+import socket
+
+import httpx
+import pytest
+from aiograpi import reqwests
+
+import config
+import fake_instagram.app
+from fake_instagram.benchmark import _serve
+from instagram.client import get_client, close_client, _rewrite_url, _record_response
+
+
+@pytest.fixture(scope='module')
+def fake_url():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    server = _serve(port)
+    yield f'http://127.0.0.1:{port}'
+    server.should_exit = True
+
+
+@pytest.fixture
+def requests(fake_url, monkeypatch):
+    # the fake runs in a thread of this process, so its lookups can be watched
+    requests = []
+
+    def find_fixture(fixtures, method, path, params=None):
+        requests.append((method, path))
+        return find(fixtures, method, path, params)
+
+    find = fake_instagram.app.find_fixture
+    monkeypatch.setattr(fake_instagram.app, 'find_fixture', find_fixture)
+    monkeypatch.setattr(config, 'INSTAGRAM_BASE_URL', fake_url)
+    monkeypatch.setattr(config, 'INSTAGRAM_REQUEST_PAUSE', 0)
+    monkeypatch.setattr(config, 'INSTAGRAM_RECORD_DIR', None)
+    return requests
+
+
+def test_client_requests_go_to_base_url(requests):
+    async def main():
+        client = await get_client(
+            'account', settings={'authorization_data': {'ds_user_id': '1', 'sessionid': '1%3Atest'}}
+        )
+        try:
+            return await client.media_like('2277033926878261772_3375193414')
+        finally:
+            await close_client(client)
+
+    assert asyncio.run(main()) is True
+    assert requests == [('POST', '/api/v1/media/2277033926878261772/like/')]
+
+
+def test_module_request_goes_to_base_url(requests):
+    response = asyncio.run(reqwests.request('GET', 'https://www.instagram.com/example/'))
+
+    assert response.status_code == 200
+    assert requests == [('GET', '/example/')]
+
+
+def test_rewrite_url_keeps_base_path(monkeypatch):
+    monkeypatch.setattr(config, 'INSTAGRAM_BASE_URL', 'http://fake:8001/instagram/')
+    request = httpx.Request('GET', 'https://i.instagram.com/api/v1/users/1/info/?a=b')
+    asyncio.run(_rewrite_url(request))
+
+    assert str(request.url) == 'http://fake:8001/instagram/api/v1/users/1/info/?a=b'
+
+
+def test_record_response(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, 'INSTAGRAM_BASE_URL', 'http://fake:8001/instagram')
+    monkeypatch.setattr(config, 'INSTAGRAM_RECORD_DIR', str(tmp_path))
+    request = httpx.Request('POST', 'http://fake:8001/instagram/api/v1/friendships/create/1903424587/')
+    asyncio.run(_record_response(httpx.Response(201, json={'status': 'ok'}, request=request)))
+
+    fixture = json.loads(next(tmp_path.iterdir()).read_text())
+    assert fixture['path'] == '/api/v1/friendships/create/{id}/'
+    assert fixture['status_code'] == 201